@@ -1,13 +1,77 @@
 from datetime import datetime
 import os
+import posixpath  # Remote FTP paths always use forward slashes
 import ftplib
 import hashlib
-from retrying import retry  # To handle retrying failed operations
-import threading  # For thread-safe connection pool
+import queue  # For the lock-free connection pool
+from collections import deque
+import re
+import socket
+import threading  # For the directory cache lock and keep-alive thread
+import time
 import logging  # For logging errors and information
 from tqdm import tqdm  # For tracking progress
 from contextlib import contextmanager
-from concurrent.futures import ThreadPoolExecutor  # For parallel file transfers
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait  # For parallel file transfers
+import asyncio
+
+try:
+    import aioftp  # Optional, only needed for parallel_download_async
+except ImportError:
+    aioftp = None
+
+logger = logging.getLogger(__name__)
+
+# Errors raised when a pooled connection has been dropped by the server or network. Other
+# OSErrors (e.g. a missing local file) are not connection problems and are not retried.
+TRANSIENT_ERRORS = (ftplib.error_temp, EOFError, ConnectionError, TimeoutError, socket.timeout)
+
+# Size of each socket read/write when streaming a byte range over a raw data connection
+TRANSFER_BLOCK_SIZE = 1 << 20
+
+# Number of transferred bytes between progress bar refreshes
+PROGRESS_UPDATE_INTERVAL = 4 << 20
+
+# Server-side hash commands from FEAT, in order of preference, with the local algorithm to match
+HASH_ALGORITHMS = (("MD5", "md5"), ("SHA-256", "sha256"), ("SHA-1", "sha1"))
+HASH_COMMANDS = (("XMD5", "md5"), ("XSHA256", "sha256"))
+
+# A hex digest token in a hash command reply
+_HEX_DIGEST = re.compile(r"\b[0-9a-fA-F]{32,128}\b")
+
+# Files smaller than this per part are transferred over a single stream
+PARALLEL_MIN_PART_SIZE = 8 << 20
+
+def _tune_socket(sock, buffer_size=None):
+    """Disables Nagle's algorithm on an FTP socket and, if given, sets its kernel buffer sizes."""
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if buffer_size:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, buffer_size)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, buffer_size)
+    except OSError:
+        pass  # Best effort; the platform may cap or refuse these options
+
+class _TunedSocketMixin:
+    """Applies _tune_socket to the control socket and to every data socket ftplib opens."""
+
+    socket_buffer_size = None  # Set before connect() to request fixed kernel buffer sizes
+
+    def connect(self, *args, **kwargs):
+        welcome = super().connect(*args, **kwargs)
+        _tune_socket(self.sock, self.socket_buffer_size)
+        return welcome
+
+    def ntransfercmd(self, cmd, rest=None):
+        conn, size = super().ntransfercmd(cmd, rest)
+        _tune_socket(conn, self.socket_buffer_size)
+        return conn, size
+
+class _FTP(_TunedSocketMixin, ftplib.FTP):
+    pass
+
+class _FTP_TLS(_TunedSocketMixin, ftplib.FTP_TLS):
+    pass
 
 # Custom exceptions for FTP errors
 class FTPConnectionError(Exception):
@@ -18,13 +82,16 @@ class FTPTransferError(Exception):
     """Custom exception for FTP transfer errors."""
     pass
 
+# Errors worth retrying with backoff; permanent (5xx) replies are raised immediately
+RETRYABLE_ERRORS = (FTPConnectionError,) + TRANSIENT_ERRORS
+
 class FTPClient:
     """
     A robust FTP/FTPS client class that supports connection pooling, timeout handling,
     retry mechanisms, transfer progress tracking, and parallel file transfers.
     """
 
-    def __init__(self, hostname, username, password, use_tls=False, max_connections=5, timeout=10, log_level=logging.INFO, retry_attempts=5, retry_multiplier=1000, retry_max=10000):
+    def __init__(self, hostname, username, password, use_tls=False, max_connections=5, timeout=10, log_level=logging.INFO, retry_attempts=5, retry_multiplier=1000, retry_max=10000, keepalive_interval=60, socket_buffer_size=None):
         """
         Initializes the FTPClient with server credentials and connection settings.
 
@@ -34,24 +101,41 @@ class FTPClient:
         :param use_tls: Whether to use FTPS (TLS) or plain FTP. Default is False (use FTPS).
         :param max_connections: Maximum number of FTP connections to pool.
         :param timeout: Timeout for the FTP connections in seconds.
-        :param log_level: Level of logging (default is INFO).
+        :param log_level: Level of logging (default is INFO), applied only if the application
+            hasn't configured logging itself.
+        :param keepalive_interval: Seconds between NOOPs on idle pooled connections once
+            connect() has been called (default is 60).
+        :param socket_buffer_size: Fixed SO_RCVBUF/SO_SNDBUF size in bytes for control and data
+            sockets. Setting it turns off the kernel's buffer autotuning, which usually does
+            better, so only use it on links whose bandwidth-delay product autotuning can't reach
+            (default is None, leaving buffers to the kernel).
         """
         self.hostname = hostname
         self.username = username
         self.password = password
         self.use_tls = use_tls
         self.timeout = timeout
-        self.connection_pool = []  # Pool of reusable FTP connections
         self.max_connections = max_connections
-        self.lock = threading.Lock()  # Ensures thread-safe access to the connection pool
+        self._pool = queue.LifoQueue(maxsize=max_connections)  # Pool of reusable FTP connections
+        self._last_used = {}  # Monotonic timestamp of when each pooled connection was last released
+        self._feat_cache = {}  # FEAT response of each connection, parsed into {feature: parameters}
+        self._stat_cache = {}  # Per-connection {path: facts} from _stat, dropped when the connection is released
+        self._dir_cache = {}  # Remote directories known to exist, with the monotonic time they were seen
+        self._dir_cache_ttl = 60.0
+        self._dir_cache_lock = threading.Lock()  # Guards mutation of _dir_cache; single-key reads are atomic
+        self._executor = None  # Shared worker pool for parallel transfers, created on demand
+        self.keepalive_interval = keepalive_interval
+        self.socket_buffer_size = socket_buffer_size
+        self._keepalive_thread = None  # Single daemon thread that keeps idle connections alive
+        self._keepalive_stop = threading.Event()
 
         self.retry_attempts = retry_attempts
         self.retry_multiplier = retry_multiplier
         self.retry_max = retry_max
 
-        # Set up logging to track client operations
-        logging.basicConfig(level=log_level)
-        self.logger = logging.getLogger(__name__)
+        # Only configure logging if the application hasn't done so already
+        if not logging.getLogger().handlers:
+            logging.basicConfig(level=log_level)
 
     def _create_connection(self):
         """
@@ -61,13 +145,12 @@ class FTPClient:
         :raises FTPConnectionError: If connection to the server fails.
         """
         try:
+            ftp = _FTP_TLS(timeout=self.timeout) if self.use_tls else _FTP(timeout=self.timeout)
+            ftp.socket_buffer_size = self.socket_buffer_size  # Applied as soon as the socket opens
+            ftp.connect(self.hostname)
+            ftp.login(self.username, self.password)
             if self.use_tls:
-                ftp = ftplib.FTP_TLS(self.hostname, timeout=self.timeout)
-                ftp.login(self.username, self.password)
                 ftp.prot_p()  # Switch to secure data connection
-            else:
-                ftp = ftplib.FTP(self.hostname, timeout=self.timeout)
-                ftp.login(self.username, self.password)
             return ftp
         except Exception as e:
             raise FTPConnectionError(f"Error connecting to FTP server: {e}")
@@ -76,20 +159,25 @@ class FTPClient:
         """
         Retrieves an available connection from the pool or creates a new one if the pool is empty.
 
+        Pooled connections are assumed to be alive; only those idle long enough to be at risk
+        of a server-side timeout are probed with NOOP before being handed out.
+
         :return: An FTP connection.
         """
-        with self.lock:
-            if len(self.connection_pool) > 0:
-                conn = self.connection_pool.pop()
-                # Check if the connection is still alive
-                try:
-                    conn.voidcmd("NOOP")  # Send a NOOP command to keep the connection alive
-                except Exception:
-                    self.logger.warning("Recreating a dropped FTP connection.")
-                    conn = self._create_connection()  # Recreate if the connection is broken
-                return conn
-            else:
-                return self._create_connection()
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            return self._create_connection()
+
+        last_used = self._last_used.pop(conn, 0)
+        if time.monotonic() - last_used > self.timeout - 5:
+            try:
+                conn.voidcmd("NOOP")
+            except Exception:
+                logger.warning("Recreating a dropped FTP connection.")
+                self._discard_connection(conn)
+                conn = self._create_connection()  # Recreate if the connection is broken
+        return conn
 
     def _release_connection(self, conn, auto_release=True):
         """
@@ -98,12 +186,29 @@ class FTPClient:
         :param conn: The FTP connection to release.
         :param auto_release: Whether to release the connection back to the pool (default is True).
         """
+        self._stat_cache.pop(conn, None)
         if auto_release:
-            with self.lock:
-                if len(self.connection_pool) < self.max_connections:
-                    self.connection_pool.append(conn)
-                else:
-                    conn.quit()  # Close the connection if the pool is full
+            self._last_used[conn] = time.monotonic()
+            try:
+                self._pool.put_nowait(conn)
+            except queue.Full:
+                self._last_used.pop(conn, None)
+                self._feat_cache.pop(conn, None)
+                conn.quit()  # Close the connection if the pool is full
+
+    def _discard_connection(self, conn):
+        """
+        Closes a broken connection without returning it to the pool.
+
+        :param conn: The FTP connection to discard.
+        """
+        self._last_used.pop(conn, None)
+        self._feat_cache.pop(conn, None)
+        self._stat_cache.pop(conn, None)
+        try:
+            conn.close()
+        except Exception:
+            pass
 
     @contextmanager
     def ftp_connection(self, auto_release=True):
@@ -113,32 +218,309 @@ class FTPClient:
         finally:
             self._release_connection(conn, auto_release)
 
+    def _exec(self, fn, auto_release=True):
+        """
+        Runs ``fn(ftp)`` on a pooled connection, reconnecting and retrying once if the
+        connection turns out to have been dropped.
+
+        :param fn: Callable taking an FTP connection.
+        :param auto_release: Whether to release the FTP connection after the operation.
+        :return: The return value of ``fn``.
+        """
+        conn = self._get_connection()
+        try:
+            try:
+                return fn(conn)
+            except TRANSIENT_ERRORS as e:
+                logger.warning(f"Recreating a dropped FTP connection: {e}")
+                self._discard_connection(conn)
+                conn = None
+                conn = self._create_connection()
+                return fn(conn)
+        except TRANSIENT_ERRORS:
+            if conn is not None:
+                self._discard_connection(conn)
+                conn = None
+            raise
+        finally:
+            if conn is not None:
+                self._release_connection(conn, auto_release)
+
+    def _exec_each(self, fn, items, auto_release=True):
+        """
+        Runs ``fn(ftp, *item)`` for every item over a single pooled connection. If the
+        connection drops, the batch resumes from the failed item on a new one.
+
+        :param fn: Callable taking an FTP connection followed by the item's fields.
+        :param items: An iterable of argument tuples.
+        :param auto_release: Whether to release the FTP connection after the operation.
+        """
+        pending = deque(items)
+
+        def run(ftp):
+            while pending:
+                fn(ftp, *pending[0])
+                pending.popleft()
+
+        self._with_retry(self._exec, run, auto_release)
+
+    def _run_pool(self, worker_fn, items):
+        """
+        Processes items on up to max_connections workers that each hold one connection for
+        their whole lifetime and pull work from a shared queue. A worker whose connection
+        drops reconnects with backoff and retries the current item; if that keeps failing
+        the worker stops and leaves its item in the queue.
+
+        :param worker_fn: Callable taking an FTP connection followed by the item's fields.
+        :param items: A list of argument tuples.
+        :return: A list of futures, one per worker, and the work queue, in which any items
+            left once all workers have finished were never processed.
+        """
+        work = queue.Queue()
+        for item in items:
+            work.put(item)
+        workers = min(self.max_connections, len(items))
+        for _ in range(workers):
+            work.put(None)  # One stop sentinel per worker, queued after all the items
+
+        def run():
+            def reconnect_and_retry(item):
+                nonlocal conn
+                if conn is not None:
+                    self._discard_connection(conn)
+                    conn = None
+                conn = self._create_connection()
+                worker_fn(conn, *item)
+
+            conn = self._get_connection()
+            try:
+                item = work.get()
+                while item is not None:
+                    try:
+                        worker_fn(conn, *item)
+                    except TRANSIENT_ERRORS as e:
+                        logger.warning(f"Recreating a dropped FTP connection: {e}")
+                        try:
+                            self._with_retry(reconnect_and_retry, item)
+                        except RETRYABLE_ERRORS:
+                            work.put(item)  # Behind the stop sentinels, so it is reported as unprocessed
+                            raise
+                    self._stat_cache.pop(conn, None)  # Items may change the files they touch
+                    item = work.get()
+            except RETRYABLE_ERRORS:
+                if conn is not None:
+                    self._discard_connection(conn)
+                    conn = None
+                raise
+            finally:
+                if conn is not None:
+                    self._release_connection(conn)
+
+        executor = self._get_executor()
+        return [executor.submit(run) for _ in range(workers)], work
+
+    @staticmethod
+    def _unprocessed(work):
+        """
+        Drains the items left in a _run_pool work queue, skipping the stop sentinels.
+
+        :param work: The work queue returned by _run_pool.
+        :return: A list of the items no worker processed.
+        """
+        items = []
+        while not work.empty():
+            item = work.get_nowait()
+            if item is not None:
+                items.append(item)
+        return items
+
+    def _features(self, ftp):
+        """
+        Returns the features the server advertises in FEAT, cached per connection.
+
+        :param ftp: The FTP connection.
+        :return: A dict mapping upper-case feature names to their parameters.
+        """
+        feats = self._feat_cache.get(ftp)
+        if feats is None:
+            try:
+                lines = ftp.sendcmd("FEAT").splitlines()[1:-1]
+            except ftplib.error_perm:
+                lines = []  # FEAT not supported
+            feats = {}
+            for line in lines:
+                name, _, params = line.strip().partition(" ")
+                feats[name.upper()] = params
+            self._feat_cache[ftp] = feats
+        return feats
+
+    def _stat(self, ftp, remote_path):
+        """
+        Returns the facts of a remote path in a single MLST round-trip, falling back to SIZE
+        and then to listing the parent directory on servers without MLST. Results are cached
+        until the connection is released.
+
+        :param ftp: The FTP connection.
+        :param remote_path: The path of the remote file or directory.
+        :return: A dict with lower-case fact names ("type" and, when known, an integer
+            "size"), or None if the path does not exist.
+        """
+        cache = self._stat_cache.setdefault(ftp, {})
+        if remote_path in cache:
+            return cache[remote_path]
+
+        facts = None
+        if "MLST" in self._features(ftp):
+            try:
+                # e.g. "250-Listing /a.bin\n type=file;size=123;modify=20240101000000; /a.bin\n250 End."
+                fact_line = ftp.sendcmd(f"MLST {remote_path}").splitlines()[1]
+                facts = {}
+                for fact in fact_line.strip().partition(" ")[0].split(";"):
+                    name, _, value = fact.partition("=")
+                    if value:
+                        facts[name.lower()] = value
+                facts["type"] = facts.get("type", "file").lower()
+                if "size" in facts:
+                    facts["size"] = int(facts["size"])
+            except ftplib.error_perm as e:
+                if not str(e).startswith("550"):
+                    raise
+        else:
+            try:
+                ftp.voidcmd("TYPE I")  # Many servers refuse SIZE in ASCII mode
+                facts = {"type": "file", "size": ftp.size(remote_path)}
+            except ftplib.error_perm as e:
+                if not str(e).startswith("550"):
+                    # SIZE is not supported either; look the entry up in its parent directory
+                    name = posixpath.basename(remote_path)
+                    for entry, is_dir in self._list_entries(ftp, posixpath.dirname(remote_path)):
+                        if entry == name:
+                            facts = {"type": "dir" if is_dir else "file"}
+                            break
+
+        cache[remote_path] = facts
+        return facts
+
+    def _with_retry(self, fn, *args, **kwargs):
+        """
+        Calls ``fn(*args, **kwargs)``, retrying with exponential backoff on connection errors
+        and temporary (4xx) FTP replies. Waits retry_multiplier * 2^attempt milliseconds
+        between attempts, capped at retry_max.
+
+        :param fn: The operation to run.
+        :return: The return value of ``fn``.
+        """
+        for attempt in range(self.retry_attempts):
+            try:
+                return fn(*args, **kwargs)
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.retry_attempts - 1:
+                    raise
+                delay = min(self.retry_max, self.retry_multiplier * (1 << attempt)) / 1000
+                logger.warning(f"Retrying in {delay:.1f}s after error: {e}")
+                time.sleep(delay)
+
+    def _get_executor(self):
+        """
+        Returns the shared thread pool used for parallel transfers, creating it if needed.
+
+        :return: A ThreadPoolExecutor with max_connections workers.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_connections, thread_name_prefix="ftp")
+        return self._executor
+
     def connect(self):
         """
         Pre-warm the connection pool by establishing a set number of FTP connections.
         """
-        for _ in range(self.max_connections):
-            self.connection_pool.append(self._create_connection())
+        self._get_executor()
+        for _ in range(self.max_connections - self._pool.qsize()):
+            self._release_connection(self._create_connection())
+
+        if self._keepalive_thread is None:
+            self._keepalive_stop.clear()
+            self._keepalive_thread = threading.Thread(target=self._keepalive_loop, name="ftp-keepalive", daemon=True)
+            self._keepalive_thread.start()
+
+    def _keepalive_loop(self):
+        """
+        Sends NOOP on pooled connections that have been idle for keepalive_interval seconds, so
+        the server doesn't drop them. Connections are taken out of the pool while probed, so a
+        NOOP never interleaves with another thread's command.
+        """
+        while not self._keepalive_stop.wait(self.keepalive_interval):
+            idle = []
+            while True:
+                try:
+                    idle.append(self._pool.get_nowait())
+                except queue.Empty:
+                    break
+
+            stale_before = time.monotonic() - self.keepalive_interval
+            for conn in idle:
+                try:
+                    if self._last_used.get(conn, 0) > stale_before:
+                        self._pool.put_nowait(conn)  # Not used, so keep its idle timestamp
+                        continue
+                    conn.voidcmd("NOOP")
+                    self._release_connection(conn)
+                except queue.Full:
+                    self._discard_connection(conn)  # Other threads refilled the pool meanwhile
+                except Exception as e:
+                    logger.warning(f"Dropping idle FTP connection that failed keep-alive: {e}")
+                    self._discard_connection(conn)
 
     def disconnect(self):
         """
         Close all connections in the pool when done.
         """
-        while self.connection_pool:
-            conn = self.connection_pool.pop()
+        if self._keepalive_thread is not None:
+            self._keepalive_stop.set()
+            self._keepalive_thread.join()
+            self._keepalive_thread = None
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            self._last_used.pop(conn, None)
+            self._feat_cache.pop(conn, None)
             try:
                 conn.quit()  # Close each connection in the pool
-                self.logger.info("Connection closed successfully.")
+                logger.info("Connection closed successfully.")
             except (ftplib.error_temp, ConnectionResetError) as e:
                 # Handle errors when the connection is already closed or reset
-                self.logger.warning(f"Connection already closed or reset: {e}")
+                logger.warning(f"Connection already closed or reset: {e}")
             except Exception as e:
                 # Catch any other unexpected exceptions
-                self.logger.error(f"Error while closing FTP connection: {e}")
-        self.logger.info("Disconnected from FTP server.")
+                logger.error(f"Error while closing FTP connection: {e}")
+        logger.info("Disconnected from FTP server.")
+
+    def upload_file(self, local_file_path, remote_file_path, progress_callback=None, auto_release=True):
+        """
+        Uploads a file to the FTP server with retry and progress tracking.
 
+        :param local_file_path: Path to the local file to be uploaded.
+        :param remote_file_path: Path on the remote server where the file will be stored.
+        :param progress_callback: Optional callback for progress tracking.
+        :param auto_release: Whether to release the FTP connection after the upload.
+        :raises FTPTransferError: If the file upload fails after retries.
+        """
+        logger.info(f"Starting upload of {local_file_path} to {remote_file_path}")
+
+        try:
+            self._with_retry(self._exec, lambda ftp: self._upload_with(ftp, local_file_path, remote_file_path, progress_callback), auto_release)
+            logger.info(f"Uploaded: {local_file_path} to {remote_file_path}")
+        except Exception as e:
+            logger.warning(f"Retry attempt for file upload: {local_file_path}")
+            raise FTPTransferError(f"Failed to upload file {local_file_path}: {e}")
 
-    @retry(wait_exponential_multiplier=1000, wait_exponential_max=10000, stop_max_attempt_number=5)
     def download_file(self, remote_file_path, local_file_path, progress_callback=None, auto_release=True):
         """
         Downloads a file from the FTP server with retry and progress tracking.
@@ -149,130 +531,311 @@ class FTPClient:
         :param auto_release: Whether to release the FTP connection after the download.
         :raises FTPTransferError: If the file download fails after retries.
         """
-        self.logger.info(f"Starting download of {remote_file_path} to {local_file_path}")
+        logger.info(f"Starting download of {remote_file_path} to {local_file_path}")
 
         try:
-            with self.ftp_connection(auto_release) as ftp:
-                total_size = ftp.size(remote_file_path)
-
-                # Open the local file in write-binary mode
-                with open(local_file_path, 'wb') as file:
-                    if progress_callback is None:
-                        with tqdm(total=total_size, unit='B', unit_scale=True, desc="Downloading") as pbar:
-                            def progress_callback(data):
-                                file.write(data)
-                                pbar.update(len(data))
-                                # Call keep_alive periodically to keep the connection alive
-                                self.keep_alive(ftp)
-                    else:
-                        def progress_callback(data):
-                            file.write(data)
-                            progress_callback(len(data))
-                            # Call keep_alive periodically to keep the connection alive
-                            self.keep_alive(ftp)
-
-                    ftp.retrbinary(f"RETR {remote_file_path}", progress_callback)
-
-                local_file_size = os.path.getsize(local_file_path)
-                if local_file_size == 0:
-                    raise FTPTransferError(f"Downloaded file {local_file_path} is empty (0KB)")
-
-                self.logger.info(f"Downloaded: {remote_file_path} to {local_file_path}")
+            self._with_retry(self._exec, lambda ftp: self._download_with(ftp, remote_file_path, local_file_path, progress_callback), auto_release)
+            logger.info(f"Downloaded: {remote_file_path} to {local_file_path}")
 
         except ftplib.error_perm as e:
             if str(e).startswith("550"):
-                self.logger.error(f"File not found on server: {remote_file_path}")
+                logger.error(f"File not found on server: {remote_file_path}")
             raise FTPTransferError(f"Failed to download file {remote_file_path}: {e}")
         except Exception as e:
             raise FTPTransferError(f"Error during download: {e}")
 
-    def periodic_keep_alive(self, ftp, interval=300):
+    def _upload_with(self, ftp, local_file_path, remote_file_path, progress_callback=None):
         """
-        Periodically sends NOOP to keep the FTP connection alive every `interval` seconds.
+        Uploads a file over the given connection, without retries or error wrapping.
+
+        :param ftp: The FTP connection to use.
+        :param local_file_path: Path to the local file to be uploaded.
+        :param remote_file_path: Path on the remote server where the file will be stored.
+        :param progress_callback: Optional callback for progress tracking.
         """
-        self.keep_alive(ftp)
-        threading.Timer(interval, self.periodic_keep_alive, args=[ftp, interval]).start()
+        with open(local_file_path, 'rb') as file:
+            # Display a progress bar if no callback is provided
+            if progress_callback is None:
+                total_size = os.path.getsize(local_file_path)
+                with tqdm(total=total_size, unit='B', unit_scale=True, desc="Uploading") as pbar:
+                    if not isinstance(ftp, ftplib.FTP_TLS):
+                        self._upload_sendfile(ftp, file, remote_file_path, pbar)
+                        return
+
+                    # TLS data channels can't use sendfile, so stream through storbinary instead
+                    sent = reported = 0
+
+                    def callback(block):
+                        nonlocal sent, reported
+                        sent += len(block)
+                        if sent - reported >= PROGRESS_UPDATE_INTERVAL:
+                            pbar.update(sent - reported)
+                            reported = sent
+
+                    ftp.storbinary(f"STOR {remote_file_path}", file, blocksize=TRANSFER_BLOCK_SIZE, callback=callback)
+                    pbar.update(sent - reported)
+            else:
+                ftp.storbinary(f"STOR {remote_file_path}", file, blocksize=TRANSFER_BLOCK_SIZE, callback=progress_callback)
 
-    @retry(wait_exponential_multiplier=1000, wait_exponential_max=10000, stop_max_attempt_number=5)
-    def upload_file(self, local_file_path, remote_file_path, progress_callback=None, auto_release=True):
+    def _upload_sendfile(self, ftp, file, remote_file_path, pbar):
         """
-        Uploads a file to the FTP server with retry and progress tracking.
+        Uploads an open file with socket.sendfile, which lets the kernel copy it straight from
+        the page cache to the data socket (falling back to send() where sendfile is missing).
 
-        :param local_file_path: Path to the local file to be uploaded.
+        :param ftp: A plain (non-TLS) FTP connection.
+        :param file: The local file, opened in binary mode.
         :param remote_file_path: Path on the remote server where the file will be stored.
+        :param pbar: The tqdm progress bar to advance.
+        :return: The server's final response.
+        """
+        ftp.voidcmd("TYPE I")
+        with ftp.transfercmd(f"STOR {remote_file_path}") as sock:
+            offset = 0
+            # Send in PROGRESS_UPDATE_INTERVAL slices so the progress bar keeps moving
+            sent = sock.sendfile(file, offset, PROGRESS_UPDATE_INTERVAL)
+            while sent:
+                offset += sent
+                pbar.update(sent)
+                sent = sock.sendfile(file, offset, PROGRESS_UPDATE_INTERVAL)
+        return ftp.voidresp()
+
+    def _download_with(self, ftp, remote_file_path, local_file_path, progress_callback=None):
+        """
+        Downloads a file over the given connection, without retries or error wrapping.
+
+        :param ftp: The FTP connection to use.
+        :param remote_file_path: Path to the file on the FTP server.
+        :param local_file_path: Local path where the downloaded file will be stored.
         :param progress_callback: Optional callback for progress tracking.
-        :param auto_release: Whether to release the FTP connection after the upload.
-        :raises FTPTransferError: If the file upload fails after retries.
+        :raises FTPTransferError: If the downloaded file is empty.
         """
-        self.logger.info(f"Starting upload of {local_file_path} to {remote_file_path}")
-        with self.ftp_connection(auto_release) as ftp:
-            try:
-                with open(local_file_path, 'rb') as file:
-                    total_size = os.path.getsize(local_file_path)
-                    # Display a progress bar if no callback is provided
-                    if progress_callback is None:
-                        with tqdm(total=total_size, unit='B', unit_scale=True, desc="Uploading") as pbar:
-                            def progress_callback(block):
-                                pbar.update(len(block))
+        received = 0
 
-                    ftp.storbinary(f"STOR {remote_file_path}", file, callback=progress_callback)
+        # Open the local file in write-binary mode, buffered to match the transfer block size
+        with open(local_file_path, 'wb', buffering=TRANSFER_BLOCK_SIZE) as file:
+            # Default progress tracking using tqdm if no callback is provided
+            if progress_callback is None:
+                try:
+                    facts = self._stat(ftp, remote_file_path)
+                except ftplib.error_perm:
+                    facts = None
+                # Without a known size, show an open-ended progress bar
+                total_size = facts.get("size") if facts else None
+
+                with tqdm(total=total_size, unit='B', unit_scale=True, desc="Downloading") as pbar:
+                    reported = 0
+
+                    def callback(data):
+                        nonlocal received, reported
+                        file.write(data)
+                        received += len(data)
+                        if received - reported >= PROGRESS_UPDATE_INTERVAL:
+                            pbar.update(received - reported)
+                            reported = received
 
-                self.logger.info(f"Uploaded: {local_file_path} to {remote_file_path}")
-            except Exception as e:
-                self.logger.warning(f"Retry attempt for file upload: {local_file_path}")
-                raise FTPTransferError(f"Failed to upload file {local_file_path}: {e}")
+                    # Download the file using RETR command
+                    ftp.retrbinary(f"RETR {remote_file_path}", callback, blocksize=TRANSFER_BLOCK_SIZE)
+                    pbar.update(received - reported)
+            else:
+                # Custom progress callback; the total size isn't needed so skip the SIZE round-trip
+                def callback(data):
+                    nonlocal received
+                    file.write(data)
+                    received += len(data)
+                    progress_callback(len(data))
 
+                ftp.retrbinary(f"RETR {remote_file_path}", callback, blocksize=TRANSFER_BLOCK_SIZE)
 
-    @retry(wait_exponential_multiplier=1000, wait_exponential_max=10000, stop_max_attempt_number=5)
-    def download_file(self, remote_file_path, local_file_path, progress_callback=None, auto_release=True):
+        # Check if the file was actually downloaded
+        if received == 0:
+            raise FTPTransferError(f"Downloaded file {local_file_path} is empty (0KB)")
+
+    def download_file_parallel(self, remote_file_path, local_file_path, parts=None):
         """
-        Downloads a file from the FTP server with retry and progress tracking.
+        Downloads a single file over several connections at once, each fetching its own byte
+        range with REST + RETR and writing it into a pre-allocated local file.
+
+        Falls back to a single-stream download for small files, when the remote size is
+        unknown, when the platform lacks os.pwrite, or when the server refuses a ranged RETR.
 
         :param remote_file_path: Path to the file on the FTP server.
         :param local_file_path: Local path where the downloaded file will be stored.
-        :param progress_callback: Optional callback for progress tracking.
-        :param auto_release: Whether to release the FTP connection after the download.
-        :raises FTPTransferError: If the file download fails after retries.
+        :param parts: Number of ranges to fetch in parallel (defaults to max_connections).
+        :raises FTPTransferError: If any part of the download fails.
         """
-        self.logger.info(f"Starting download of {remote_file_path} to {local_file_path}")
+        parts = parts or self.max_connections
 
-        try:
-            with self.ftp_connection(auto_release) as ftp:
-                # Open the local file in write-binary mode
-                with open(local_file_path, 'wb') as file:
-                    total_size = ftp.size(remote_file_path)
-
-                    # Default progress tracking using tqdm if no callback is provided
-                    if progress_callback is None:
-                        with tqdm(total=total_size, unit='B', unit_scale=True, desc="Downloading") as pbar:
-                            def progress_callback(data):
-                                file.write(data)
-                                pbar.update(len(data))
-                    else:
-                        # Custom progress callback
-                        def progress_callback(data):
-                            file.write(data)
-                            if progress_callback:
-                                progress_callback(len(data))
+        def remote_size(ftp):
+            facts = self._stat(ftp, remote_file_path)
+            return facts.get("size") if facts else None
 
-                    # Download the file using RETR command
-                    ftp.retrbinary(f"RETR {remote_file_path}", progress_callback)
+        try:
+            size = self._exec(remote_size)
+        except ftplib.all_errors as e:
+            raise FTPTransferError(f"Failed to download file {remote_file_path}: {e}")
 
-                # Check if the file was actually downloaded
-                local_file_size = os.path.getsize(local_file_path)
-                if local_file_size == 0:
-                    raise FTPTransferError(f"Downloaded file {local_file_path} is empty (0KB)")
+        if not size or parts < 2 or size < 2 * PARALLEL_MIN_PART_SIZE or not hasattr(os, "pwrite"):
+            return self.download_file(remote_file_path, local_file_path)
 
-                self.logger.info(f"Downloaded: {remote_file_path} to {local_file_path}")
+        parts = min(parts, size // PARALLEL_MIN_PART_SIZE)
+        part_size = -(-size // parts)  # Ceiling division
+        logger.info(f"Starting {parts}-part download of {remote_file_path} to {local_file_path}")
 
+        def download_part(offset, end):
+            conn = self._get_connection()
+            try:
+                conn.voidcmd("TYPE I")
+                sock = conn.transfercmd(f"RETR {remote_file_path}", rest=offset)
+                try:
+                    while offset < end:
+                        data = sock.recv(min(TRANSFER_BLOCK_SIZE, end - offset))
+                        if not data:
+                            break
+                        os.pwrite(fd, data, offset)
+                        offset += len(data)
+                    if offset < end:
+                        raise FTPTransferError(f"Connection closed early while downloading {remote_file_path}")
+                    if end == size and hasattr(sock, "unwrap"):
+                        sock.unwrap()
+                finally:
+                    sock.close()
+
+                if end == size:
+                    conn.voidresp()
+                else:
+                    # Closing the data channel early makes the server abort the RETR; read its
+                    # reply so the control channel is back in sync and can be reused
+                    try:
+                        conn.voidresp()
+                    except ftplib.error_temp as e:
+                        if not str(e).startswith(("426", "451")):
+                            raise
+                self._release_connection(conn)
+            except ftplib.error_perm:
+                self._release_connection(conn)  # The final reply was read, so the connection is reusable
+                raise
+            except Exception:
+                self._discard_connection(conn)
+                raise
+
+        rejected = None
+        fd = os.open(local_file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o666)
+        try:
+            os.ftruncate(fd, size)
+            executor = self._get_executor()
+            futures = [executor.submit(download_part, offset, min(offset + part_size, size))
+                       for offset in range(0, size, part_size)]
+            wait(futures)
+            for future in futures:
+                future.result()
         except ftplib.error_perm as e:
-            if str(e).startswith("550"):
-                self.logger.error(f"File not found on server: {remote_file_path}")
+            rejected = e
+        except Exception as e:
             raise FTPTransferError(f"Failed to download file {remote_file_path}: {e}")
+        finally:
+            os.close(fd)
+
+        if rejected is not None:
+            # The server doesn't allow RETR at an offset
+            logger.warning(f"Server rejected a ranged RETR ({rejected}), falling back to a single-stream download.")
+            return self.download_file(remote_file_path, local_file_path)
+
+        logger.info(f"Downloaded: {remote_file_path} to {local_file_path}")
+
+    def upload_file_parallel(self, local_file_path, remote_file_path, parts=None):
+        """
+        Uploads a single file over several connections at once, each writing its own byte
+        range with REST + STOR.
+
+        Only used when the server advertises REST STREAM in FEAT; otherwise, and for small
+        files, falls back to a single-stream upload.
+
+        :param local_file_path: Path to the local file to be uploaded.
+        :param remote_file_path: Path on the remote server where the file will be stored.
+        :param parts: Number of ranges to send in parallel (defaults to max_connections).
+        :raises FTPTransferError: If any part of the upload fails.
+        """
+        parts = parts or self.max_connections
+        size = os.path.getsize(local_file_path)
+
+        try:
+            rest = self._exec(self._features).get("REST", "")
+        except ftplib.all_errors:
+            rest = ""
+
+        if parts < 2 or size < 2 * PARALLEL_MIN_PART_SIZE or rest.upper() != "STREAM":
+            return self.upload_file(local_file_path, remote_file_path)
+
+        parts = min(parts, size // PARALLEL_MIN_PART_SIZE)
+        part_size = -(-size // parts)  # Ceiling division
+        logger.info(f"Starting {parts}-part upload of {local_file_path} to {remote_file_path}")
+
+        def upload_part(offset, end):
+            conn = self._get_connection()
+            try:
+                conn.voidcmd("TYPE I")
+                with open(local_file_path, 'rb') as file:
+                    file.seek(offset)
+                    sock = conn.transfercmd(f"STOR {remote_file_path}", rest=offset or None)
+                    try:
+                        while offset < end:
+                            data = file.read(min(TRANSFER_BLOCK_SIZE, end - offset))
+                            if not data:
+                                break
+                            sock.sendall(data)
+                            offset += len(data)
+                        if hasattr(sock, "unwrap"):
+                            sock.unwrap()
+                    finally:
+                        sock.close()
+                conn.voidresp()
+                self._release_connection(conn)
+            except ftplib.error_perm:
+                self._release_connection(conn)  # The final reply was read, so the connection is reusable
+                raise
+            except Exception:
+                self._discard_connection(conn)
+                raise
+
+        try:
+            # Send the first part as a plain STOR so the remote file exists, and holds real
+            # data, before any other part RESTs into it
+            upload_part(0, part_size)
+            executor = self._get_executor()
+            futures = {offset: executor.submit(upload_part, offset, min(offset + part_size, size))
+                       for offset in range(part_size, size, part_size)}
+            wait(futures.values())
+            refused = []
+            for offset in sorted(futures):
+                try:
+                    futures[offset].result()
+                except ftplib.error_perm as e:
+                    if not str(e).startswith("554"):
+                        raise
+                    refused.append(offset)
+
+            if refused:
+                # Some servers only REST up to the current end of file, so a part can't start
+                # before the ones ahead of it finish. Resend the refused parts in order, each
+                # starting where the file now ends.
+                logger.warning(f"Server refused to REST past the end of {remote_file_path}, "
+                               f"sending {len(refused)} of {parts} parts one after another.")
+                for offset in refused:
+                    upload_part(offset, min(offset + part_size, size))
+
+            facts = self._exec(lambda ftp: self._stat(ftp, remote_file_path))
+            remote_size = facts.get("size") if facts else None
+            if remote_size is not None and remote_size != size:
+                raise FTPTransferError(f"Remote size {remote_size} does not match local size {size}")
+        except ftplib.error_perm as e:
+            # The server doesn't allow STOR at an offset at all
+            logger.warning(f"Server rejected a ranged STOR ({e}), falling back to a single-stream upload.")
+            return self.upload_file(local_file_path, remote_file_path)
         except Exception as e:
-            raise FTPTransferError(f"Error during download: {e}")
+            raise FTPTransferError(f"Failed to upload file {local_file_path}: {e}")
+
+        logger.info(f"Uploaded: {local_file_path} to {remote_file_path}")
 
-    @retry(wait_exponential_multiplier=1000, wait_exponential_max=10000, stop_max_attempt_number=5)
     def list_files(self, remote_path, only_files=True, auto_release=True):
         """
         Lists the files in a specified directory on the FTP server.
@@ -284,32 +847,45 @@ class FTPClient:
         :raises FTPTransferError: If listing files fails.
         """
         try:
-            with self.ftp_connection(auto_release) as ftp:
-                files = ftp.nlst(remote_path)  # List files and directories in the directory
-                if only_files:
-                    files = [f for f in files if not self._is_directory(ftp, f)]  # Filter out directories
-                return files
+            entries = self._with_retry(self._exec, lambda ftp: self._list_entries(ftp, remote_path), auto_release)
+            return [name for name, is_dir in entries if not (only_files and is_dir)]
         except ftplib.error_perm as e:
             if str(e).startswith("550"):  # Handle empty directory
-                self.logger.warning(f"Directory {remote_path} is empty or not accessible.")
+                logger.warning(f"Directory {remote_path} is empty or not accessible.")
                 return []  # Return empty list for empty directory
             raise FTPTransferError(f"Failed to list files in {remote_path}: {e}")
 
-    def _is_directory(self, ftp, item):
+    def _list_entries(self, ftp, remote_path):
         """
-        Checks if the given item is a directory.
+        Lists a directory in a single round-trip, using MLSD when the server supports it and
+        falling back to parsing a Unix-style LIST otherwise.
 
         :param ftp: The FTP connection.
-        :param item: The item path to check.
-        :return: True if the item is a directory, False otherwise.
+        :param remote_path: The directory path on the remote server.
+        :return: A list of (name, is_directory) tuples, excluding "." and "..".
+        :raises ftplib.error_perm: If the directory cannot be listed.
         """
-        current = ftp.pwd()  # Save the current working directory
         try:
-            ftp.cwd(item)  # Try to change to the item as if it were a directory
-            ftp.cwd(current)  # Change back to the original directory
-            return True
-        except ftplib.error_perm:  # If permission is denied, it's a file
-            return False
+            # Use the server's default facts, which include "type", to avoid an OPTS round-trip
+            return [(name, facts.get("type", "file").lower() == "dir")
+                    for name, facts in ftp.mlsd(remote_path)
+                    if facts.get("type", "").lower() not in ("cdir", "pdir")]
+        except ftplib.error_perm as e:
+            if str(e).startswith("550"):
+                raise
+
+        lines = []
+        ftp.retrlines(f"LIST {remote_path}", lines.append)
+        entries = []
+        for line in lines:
+            parts = line.split(None, 8)
+            if len(parts) < 9 or parts[8] in (".", ".."):
+                continue
+            name = parts[8]
+            if line.startswith("l"):
+                name = name.split(" -> ", 1)[0]  # e.g. "link -> target"
+            entries.append((name, line.startswith("d")))
+        return entries
 
     def directory_exists(self, remote_path, auto_release=True):
         """
@@ -320,13 +896,29 @@ class FTPClient:
         :return: True if the directory exists, False otherwise.
         """
         try:
-            with self.ftp_connection(auto_release) as ftp:
-                ftp.cwd(remote_path)
-                return True
+            self._exec(lambda ftp: ftp.cwd(remote_path), auto_release)
+            return True
         except ftplib.error_perm:
             return False
 
-    @retry(wait_exponential_multiplier=1000, wait_exponential_max=10000, stop_max_attempt_number=5)
+    def _ensure_dir(self, remote_path):
+        """
+        Makes sure a remote directory exists, creating it if needed. Directories seen within
+        the last _dir_cache_ttl seconds are trusted without a round-trip.
+
+        :param remote_path: The path of the remote directory.
+        :raises FTPTransferError: If the directory cannot be created.
+        """
+        seen = self._dir_cache.get(remote_path)
+        if seen is not None and time.monotonic() - seen < self._dir_cache_ttl:
+            return
+
+        if not self.directory_exists(remote_path):
+            self.create_directory(remote_path)
+
+        with self._dir_cache_lock:
+            self._dir_cache[remote_path] = time.monotonic()
+
     def move_file(self, src_remote_path, dest_remote_directory, auto_release=True, overwrite=True):
         """
         Moves a file from one directory to another on the FTP server.
@@ -338,40 +930,37 @@ class FTPClient:
         :raises FTPTransferError: If moving the file fails after retries.
         """
         try:
-            with self.ftp_connection(auto_release) as ftp:
-                # Extract the file name from the source path
-                file_name = os.path.basename(src_remote_path)
-
-                # Ensure the destination directory exists
-                if not self.directory_exists(dest_remote_directory, auto_release=False):
-                    self.create_directory(dest_remote_directory, auto_release=False)
-                    self.logger.info(f"Created directory: {dest_remote_directory}")
-
-                # Construct the destination path
-                dest_remote_path = os.path.join(dest_remote_directory, file_name)
-
-                # Check if file exists in destination
-                dest_exists = self.check_file_exists(dest_remote_path, auto_release=False)
+            # Extract the file name from the source path
+            file_name = posixpath.basename(src_remote_path)
+
+            # Ensure the destination directory exists
+            self._ensure_dir(dest_remote_directory)
+
+            # Construct the destination path
+            dest_remote_path = posixpath.join(dest_remote_directory, file_name)
+
+            # Check if file exists in destination
+            dest_exists = self.check_file_exists(dest_remote_path)
+
+            if dest_exists:
+                if overwrite:
+                    # Delete existing file if overwrite is True
+                    try:
+                        self._with_retry(self._exec, lambda ftp: ftp.delete(dest_remote_path))
+                        logger.info(f"Deleted existing file at destination: {dest_remote_path}")
+                    except ftplib.error_perm as e:
+                        raise FTPTransferError(f"Failed to delete existing file at {dest_remote_path}: {e}")
+                else:
+                    # Generate a unique filename using timestamp
+                    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+                    file_base, file_ext = posixpath.splitext(file_name)
+                    new_file_name = f"{file_base}_{timestamp}{file_ext}"
+                    dest_remote_path = posixpath.join(dest_remote_directory, new_file_name)
+                    logger.info(f"File exists at destination, using unique name: {new_file_name}")
 
-                if dest_exists:
-                    if overwrite:
-                        # Delete existing file if overwrite is True
-                        try:
-                            ftp.delete(dest_remote_path)
-                            self.logger.info(f"Deleted existing file at destination: {dest_remote_path}")
-                        except ftplib.error_perm as e:
-                            raise FTPTransferError(f"Failed to delete existing file at {dest_remote_path}: {e}")
-                    else:
-                        # Generate a unique filename using timestamp
-                        timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-                        file_base, file_ext = os.path.splitext(file_name)
-                        new_file_name = f"{file_base}_{timestamp}{file_ext}"
-                        dest_remote_path = os.path.join(dest_remote_directory, new_file_name)
-                        self.logger.info(f"File exists at destination, using unique name: {new_file_name}")
-
-                # Move (rename) the file
-                ftp.rename(src_remote_path, dest_remote_path)
-                self.logger.info(f"Moved file from {src_remote_path} to {dest_remote_path}")
+            # Move (rename) the file
+            self._with_retry(self._exec, lambda ftp: ftp.rename(src_remote_path, dest_remote_path), auto_release)
+            logger.info(f"Moved file from {src_remote_path} to {dest_remote_path}")
 
         except ftplib.error_perm as e:
             error_msg = str(e)
@@ -384,7 +973,6 @@ class FTPClient:
         except Exception as e:
             raise FTPTransferError(f"Failed to move file from {src_remote_path} to {dest_remote_directory}: {e}")
 
-    @retry(wait_exponential_multiplier=1000, wait_exponential_max=10000, stop_max_attempt_number=5)
     def rename_file(self, old_remote_path, new_remote_path, auto_release=True):
         """
         Renames a file on the FTP server.
@@ -395,13 +983,11 @@ class FTPClient:
         :raises FTPTransferError: If the file renaming fails after retries.
         """
         try:
-            with self.ftp_connection(auto_release) as ftp:
-                ftp.rename(old_remote_path, new_remote_path)
-                self.logger.info(f"Renamed file from {old_remote_path} to {new_remote_path}")
+            self._with_retry(self._exec, lambda ftp: ftp.rename(old_remote_path, new_remote_path), auto_release)
+            logger.info(f"Renamed file from {old_remote_path} to {new_remote_path}")
         except Exception as e:
             raise FTPTransferError(f"Failed to rename file from {old_remote_path} to {new_remote_path}: {e}")
 
-    @retry(wait_exponential_multiplier=1000, wait_exponential_max=10000, stop_max_attempt_number=5)
     def delete_file(self, remote_file_path, auto_release=True):
         """
         Deletes a file from the FTP server.
@@ -411,12 +997,45 @@ class FTPClient:
         :raises FTPTransferError: If the file deletion fails after retries.
         """
         try:
-            with self.ftp_connection(auto_release) as ftp:
-                ftp.delete(remote_file_path)
-                self.logger.info(f"Deleted file: {remote_file_path}")
+            self._with_retry(self._exec, lambda ftp: ftp.delete(remote_file_path), auto_release)
+            logger.info(f"Deleted file: {remote_file_path}")
         except Exception as e:
             raise FTPTransferError(f"Failed to delete file {remote_file_path}: {e}")
 
+    def delete_files(self, remote_file_paths, auto_release=True):
+        """
+        Deletes several files from the FTP server over a single connection.
+
+        :param remote_file_paths: The paths of the remote files to be deleted.
+        :param auto_release: Whether to release the FTP connection after the operation.
+        :raises FTPTransferError: If a file deletion fails after retries; later files are not deleted.
+        """
+        def delete(ftp, remote_file_path):
+            ftp.delete(remote_file_path)
+            logger.info(f"Deleted file: {remote_file_path}")
+
+        try:
+            self._exec_each(delete, [(path,) for path in remote_file_paths], auto_release)
+        except Exception as e:
+            raise FTPTransferError(f"Failed to delete files: {e}")
+
+    def rename_files(self, renames, auto_release=True):
+        """
+        Renames several files on the FTP server over a single connection.
+
+        :param renames: A list of tuples with old and new remote paths [(old, new), ...].
+        :param auto_release: Whether to release the FTP connection after the operation.
+        :raises FTPTransferError: If a file renaming fails after retries; later files are not renamed.
+        """
+        def rename(ftp, old_remote_path, new_remote_path):
+            ftp.rename(old_remote_path, new_remote_path)
+            logger.info(f"Renamed file from {old_remote_path} to {new_remote_path}")
+
+        try:
+            self._exec_each(rename, renames, auto_release)
+        except Exception as e:
+            raise FTPTransferError(f"Failed to rename files: {e}")
+
     def check_file_exists(self, remote_file_path, auto_release=True):
         """
         Checks if a file exists on the FTP server.
@@ -426,14 +1045,12 @@ class FTPClient:
         :return: True if the file exists, False otherwise.
         """
         try:
-            with self.ftp_connection(auto_release) as ftp:
-                files = ftp.nlst(os.path.dirname(remote_file_path))  # List files in the directory
-                return os.path.basename(remote_file_path) in files
+            facts = self._exec(lambda ftp: self._stat(ftp, remote_file_path), auto_release)
+            return facts is not None and facts["type"] == "file"
         except Exception as e:
-            self.logger.error(f"Failed to check if file exists {remote_file_path}: {e}")
+            logger.error(f"Failed to check if file exists {remote_file_path}: {e}")
             return False
 
-    @retry(wait_exponential_multiplier=1000, wait_exponential_max=10000, stop_max_attempt_number=5)
     def create_directory(self, remote_directory_path, auto_release=True):
         """
         Creates a new directory on the FTP server.
@@ -443,13 +1060,11 @@ class FTPClient:
         :raises FTPTransferError: If the directory creation fails after retries.
         """
         try:
-            with self.ftp_connection(auto_release) as ftp:
-                ftp.mkd(remote_directory_path)
-                self.logger.info(f"Created directory: {remote_directory_path}")
+            self._with_retry(self._exec, lambda ftp: ftp.mkd(remote_directory_path), auto_release)
+            logger.info(f"Created directory: {remote_directory_path}")
         except Exception as e:
             raise FTPTransferError(f"Failed to create directory {remote_directory_path}: {e}")
 
-    @retry(wait_exponential_multiplier=1000, wait_exponential_max=10000, stop_max_attempt_number=5)
     def remove_directory(self, remote_directory_path, auto_release=True):
         """
         Removes a directory from the FTP server.
@@ -459,9 +1074,12 @@ class FTPClient:
         :raises FTPTransferError: If the directory removal fails after retries.
         """
         try:
-            with self.ftp_connection(auto_release) as ftp:
-                ftp.rmd(remote_directory_path)
-                self.logger.info(f"Removed directory: {remote_directory_path}")
+            self._with_retry(self._exec, lambda ftp: ftp.rmd(remote_directory_path), auto_release)
+            with self._dir_cache_lock:
+                prefix = remote_directory_path.rstrip("/") + "/"
+                for path in [p for p in self._dir_cache if p == remote_directory_path or p.startswith(prefix)]:
+                    del self._dir_cache[path]
+            logger.info(f"Removed directory: {remote_directory_path}")
         except Exception as e:
             raise FTPTransferError(f"Failed to remove directory {remote_directory_path}: {e}")
 
@@ -474,9 +1092,8 @@ class FTPClient:
         :raises FTPTransferError: If changing directory fails after retries.
         """
         try:
-            with self.ftp_connection(auto_release) as ftp:
-                ftp.cwd(remote_directory_path)
-                self.logger.info(f"Changed directory to: {remote_directory_path}")
+            self._exec(lambda ftp: ftp.cwd(remote_directory_path), auto_release)
+            logger.info(f"Changed directory to: {remote_directory_path}")
         except Exception as e:
             raise FTPTransferError(f"Failed to change directory to {remote_directory_path}: {e}")
 
@@ -487,11 +1104,73 @@ class FTPClient:
         :param file_path: Path to the file for which to calculate the checksum.
         :return: The MD5 checksum as a hexadecimal string.
         """
-        hash_md5 = hashlib.md5()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+        return self.calculate_checksum(file_path, "md5")
+
+    def calculate_checksum(self, file_path, algorithm):
+        """
+        Calculates the checksum of a file with any hashlib algorithm.
+
+        :param file_path: Path to the file for which to calculate the checksum.
+        :param algorithm: The hashlib algorithm name, e.g. "md5" or "sha256".
+        :return: The checksum as a hexadecimal string.
+        """
+        with open(file_path, "rb", buffering=0) as f:
+            if hasattr(hashlib, "file_digest"):  # Python 3.11+, hashes without holding the GIL
+                return hashlib.file_digest(f, algorithm).hexdigest()
+
+            # Reuse one buffer instead of allocating a new bytes object per read
+            digest = hashlib.new(algorithm)
+            buf = bytearray(TRANSFER_BLOCK_SIZE)
+            view = memoryview(buf)
+            n = f.readinto(buf)
+            while n:
+                digest.update(view[:n])
+                n = f.readinto(buf)
+        return digest.hexdigest()
+
+    def _remote_checksum(self, ftp, remote_file_path):
+        """
+        Asks the server for a file checksum using the best hash command it advertises
+        (HASH, XMD5, XSHA256), then SITE MD5. If none work, streams the file and hashes it
+        in memory without writing it to disk.
+
+        :param ftp: The FTP connection.
+        :param remote_file_path: The path of the remote file on the FTP server.
+        :return: A (hashlib algorithm name, hex digest) tuple.
+        """
+        feats = self._features(ftp)
+        commands = []
+        if "HASH" in feats:
+            offered = {alg.rstrip("*").upper(): alg.endswith("*") for alg in feats["HASH"].split(";")}
+            for name, algorithm in HASH_ALGORITHMS:
+                if name in offered:
+                    if not offered[name]:  # Not the currently selected algorithm
+                        commands.append((f"OPTS HASH {name}", None))
+                    commands.append((f"HASH {remote_file_path}", algorithm))
+                    break
+        for name, algorithm in HASH_COMMANDS:
+            if name in feats:
+                commands.append((f"{name} {remote_file_path}", algorithm))
+        commands.append((f"SITE MD5 {remote_file_path}", "md5"))
+
+        for cmd, algorithm in commands:
+            try:
+                resp = ftp.sendcmd(cmd)
+            except ftplib.error_perm:
+                continue
+            if algorithm is None:
+                continue
+            if cmd.startswith("HASH "):
+                # The reply names the algorithm actually used, e.g. "213 SHA-256 0-49 <digest> <file>"
+                algorithm = dict(HASH_ALGORITHMS).get(resp[4:].split(" ", 1)[0].upper(), algorithm)
+            match = _HEX_DIGEST.search(resp[4:])
+            if match:
+                return algorithm, match.group(0).lower()
+
+        logger.warning("No server-side checksum command available. Streaming remote file for checksum comparison.")
+        digest = hashlib.md5()
+        ftp.retrbinary(f"RETR {remote_file_path}", digest.update, blocksize=TRANSFER_BLOCK_SIZE)
+        return "md5", digest.hexdigest()
 
     def verify_file_integrity(self, local_file_path, remote_file_path, auto_release=True):
         """
@@ -502,57 +1181,125 @@ class FTPClient:
         :param auto_release: Whether to release the FTP connection after the operation.
         :raises FTPTransferError: If verification fails.
         """
-        local_checksum = self.calculate_md5(local_file_path)
         try:
-            with self.ftp_connection(auto_release) as ftp:
-                try:
-                    # First, compare file sizes
-                    local_size = os.path.getsize(local_file_path)
-                    remote_size = ftp.size(remote_file_path)
-                    if local_size != remote_size:
-                        raise FTPTransferError(f"File size mismatch for {local_file_path} and {remote_file_path}")
-
-                    # Then, try to fetch the MD5 checksum if supported by the server
-                    remote_checksum = ftp.sendcmd(f'SITE MD5 {remote_file_path}')
-                    remote_checksum = remote_checksum.split(' ')[1]  # Parse the response
-                except Exception:
-                    self.logger.warning("SITE MD5 command not supported. Downloading remote file for checksum comparison.")
-                    remote_file_path_temp = f"{local_file_path}.temp"
-                    self.download_file(remote_file_path, remote_file_path_temp)
-                    remote_checksum = self.calculate_md5(remote_file_path_temp)
-                    os.remove(remote_file_path_temp)  # Cleanup temporary file
-
-                if local_checksum != remote_checksum:
-                    raise FTPTransferError(f"Checksum mismatch for {local_file_path} and {remote_file_path}")
-                self.logger.info(f"Checksum verified for {local_file_path} and {remote_file_path}")
+            def fetch_checksum(ftp):
+                # First, compare file sizes when the server reports one
+                local_size = os.path.getsize(local_file_path)
+                facts = self._stat(ftp, remote_file_path)
+                if facts is None:
+                    raise FTPTransferError(f"Remote file {remote_file_path} does not exist")
+                if "size" in facts and local_size != facts["size"]:
+                    raise FTPTransferError(f"File size mismatch for {local_file_path} and {remote_file_path}")
+
+                # Then compare checksums, computed by the server when it supports it
+                return self._remote_checksum(ftp, remote_file_path)
+
+            algorithm, remote_checksum = self._exec(fetch_checksum, auto_release)
+            local_checksum = self.calculate_checksum(local_file_path, algorithm)
+
+            if local_checksum != remote_checksum:
+                raise FTPTransferError(f"Checksum mismatch for {local_file_path} and {remote_file_path}")
+            logger.info(f"Checksum verified for {local_file_path} and {remote_file_path}")
 
         except Exception as e:
             raise FTPTransferError(f"Failed to verify integrity for {local_file_path}: {e}")
 
     def parallel_upload(self, files):
         """
-        Uploads multiple files in parallel using multiple threads.
+        Uploads multiple files in parallel, with each worker thread reusing one connection
+        for all the files it handles.
 
         :param files: A list of tuples with local and remote file paths [(local, remote), ...].
         """
-        with ThreadPoolExecutor(max_workers=self.max_connections) as executor:
-            futures = [executor.submit(self.upload_file, local, remote) for local, remote in files]
-            for future in futures:
-                try:
-                    future.result()  # Wait for each upload to complete
-                except FTPTransferError as e:
-                    self.logger.error(f"Error during parallel upload: {e}")
+        def upload(ftp, local, remote):
+            try:
+                self._upload_with(ftp, local, remote)
+                logger.info(f"Uploaded: {local} to {remote}")
+            except TRANSIENT_ERRORS:
+                raise  # Let the worker reconnect and retry
+            except Exception as e:
+                logger.error(f"Error during parallel upload: Failed to upload file {local}: {e}")
+
+        futures, work = self._run_pool(upload, files)
+        for future in as_completed(futures):
+            try:
+                future.result()  # Handle each worker as soon as it finishes
+            except Exception as e:
+                logger.error(f"Error during parallel upload, worker stopped: {e}")
+        for local, _ in self._unprocessed(work):
+            logger.error(f"Error during parallel upload: File {local} was not uploaded")
 
     def parallel_download(self, files):
         """
-        Downloads multiple files in parallel using multiple threads.
+        Downloads multiple files in parallel, with each worker thread reusing one connection
+        for all the files it handles.
 
         :param files: A list of tuples with remote and local file paths [(remote, local), ...].
         """
-        with ThreadPoolExecutor(max_workers=self.max_connections) as executor:
-            futures = [executor.submit(self.download_file, remote, local) for remote, local in files]
-            for future in futures:
-                try:
-                    future.result()  # Wait for each download to complete
-                except FTPTransferError as e:
-                    self.logger.error(f"Error during parallel download: {e}")
+        def download(ftp, remote, local):
+            try:
+                self._download_with(ftp, remote, local)
+                logger.info(f"Downloaded: {remote} to {local}")
+            except TRANSIENT_ERRORS:
+                raise  # Let the worker reconnect and retry
+            except Exception as e:
+                logger.error(f"Error during parallel download: Failed to download file {remote}: {e}")
+
+        futures, work = self._run_pool(download, files)
+        for future in as_completed(futures):
+            try:
+                future.result()  # Handle each worker as soon as it finishes
+            except Exception as e:
+                logger.error(f"Error during parallel download, worker stopped: {e}")
+        for remote, _ in self._unprocessed(work):
+            logger.error(f"Error during parallel download: File {remote} was not downloaded")
+
+    def _async_client(self):
+        """
+        Returns an aioftp client context manager logged in with this client's settings.
+
+        :return: An async context manager yielding a connected aioftp.Client.
+        """
+        kwargs = {"upgrade_to_tls": True} if self.use_tls else {}
+        return aioftp.Client.context(self.hostname, user=self.username, password=self.password,
+                                     socket_timeout=self.timeout, **kwargs)
+
+    async def parallel_download_async(self, files, concurrency=100):
+        """
+        Downloads multiple files from a single asyncio event loop using aioftp, which scales
+        to far more simultaneous transfers than threads. Meant for workloads of thousands of
+        small files; requires the optional aioftp package.
+
+        :param files: A list of tuples with remote and local file paths [(remote, local), ...].
+        :param concurrency: Maximum number of simultaneous connections (default is 100).
+        :raises ImportError: If aioftp is not installed.
+        """
+        if aioftp is None:
+            raise ImportError("parallel_download_async requires the aioftp package")
+
+        work = asyncio.Queue()
+        for item in files:
+            work.put_nowait(item)
+
+        async def run():
+            # Each worker holds one connection and downloads files until the queue is drained
+            async with self._async_client() as client:
+                while not work.empty():
+                    remote, local = work.get_nowait()
+                    try:
+                        await client.download(remote, local, write_into=True, block_size=TRANSFER_BLOCK_SIZE)
+                        logger.info(f"Downloaded: {remote} to {local}")
+                    except (ConnectionError, TimeoutError, asyncio.TimeoutError, EOFError) as e:
+                        logger.error(f"Error during parallel download: Failed to download file {remote}: {e}")
+                        raise  # The connection is gone; stop this worker
+                    except Exception as e:
+                        logger.error(f"Error during parallel download: Failed to download file {remote}: {e}")
+
+        workers = min(concurrency, len(files))
+        results = await asyncio.gather(*(run() for _ in range(workers)), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Error during parallel download, worker stopped: {result}")
+        while not work.empty():
+            remote, _ = work.get_nowait()
+            logger.error(f"Error during parallel download: File {remote} was not downloaded")
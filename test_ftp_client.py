@@ -0,0 +1,119 @@
+import ftplib
+import os
+import threading
+
+import pytest
+
+pytest.importorskip("pyftpdlib")
+from pyftpdlib.authorizers import DummyAuthorizer
+from pyftpdlib.handlers import FTPHandler
+from pyftpdlib.servers import ThreadedFTPServer
+
+import ftp_client
+from ftp_client import FTPClient, FTPTransferError
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """Runs a local pyftpdlib server rooted at tmp_path/"root" and points the client at it."""
+    root = tmp_path / "root"
+    root.mkdir()
+    authorizer = DummyAuthorizer()
+    authorizer.add_user("user", "pass", str(root), perm="elradfmwMT")
+    handler = type("Handler", (FTPHandler,), {"authorizer": authorizer})
+    srv = ThreadedFTPServer(("127.0.0.1", 0), handler)
+    monkeypatch.setattr(ftp_client._FTP, "port", srv.address[1])
+    stop = threading.Event()
+
+    def serve():
+        while not stop.is_set():
+            srv.serve_forever(timeout=0.1, blocking=False, handle_exit=False)
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield root
+    stop.set()
+    thread.join()  # Stop polling before the sockets are closed
+    srv.close_all()
+
+
+@pytest.fixture
+def client(server):
+    client = FTPClient("127.0.0.1", "user", "pass", max_connections=3)
+    yield client
+    client.disconnect()
+
+
+@pytest.fixture
+def local_file(tmp_path):
+    path = tmp_path / "source.bin"
+    path.write_bytes(os.urandom(2 * ftp_client.PARALLEL_MIN_PART_SIZE + 12345))
+    return path
+
+
+def test_upload_file_parallel(client, server, local_file):
+    client.upload_file_parallel(str(local_file), "/target.bin", parts=2)
+    assert (server / "target.bin").read_bytes() == local_file.read_bytes()
+
+
+def test_upload_file_parallel_many_parts(client, server, tmp_path, caplog):
+    # pyftpdlib refuses REST past the end of file, so parts beyond the second are resent in order
+    local_file = tmp_path / "large.bin"
+    local_file.write_bytes(os.urandom(4 * ftp_client.PARALLEL_MIN_PART_SIZE + 12345))
+    client.upload_file_parallel(str(local_file), "/target.bin", parts=4)
+    assert (server / "target.bin").read_bytes() == local_file.read_bytes()
+    assert "single-stream" not in caplog.text
+
+
+def test_upload_file_parallel_unknown_remote_size(client, server, local_file, monkeypatch):
+    monkeypatch.setattr(client, "_stat", lambda ftp, path: {"type": "file"})
+    client.upload_file_parallel(str(local_file), "/target.bin", parts=2)
+    assert (server / "target.bin").read_bytes() == local_file.read_bytes()
+
+
+def test_upload_file_parallel_size_mismatch(client, local_file, monkeypatch):
+    stat = client._stat
+    monkeypatch.setattr(client, "_stat", lambda ftp, path: dict(stat(ftp, path), size=0))
+    with pytest.raises(FTPTransferError):
+        client.upload_file_parallel(str(local_file), "/target.bin", parts=2)
+
+
+def test_download_file_parallel(client, server, local_file, tmp_path):
+    (server / "source.bin").write_bytes(local_file.read_bytes())
+    target = tmp_path / "target.bin"
+    client.download_file_parallel("/source.bin", str(target), parts=2)
+    assert target.read_bytes() == local_file.read_bytes()
+    assert client._pool.qsize() == 2  # Every part's connection went back to the pool
+
+
+def test_parallel_upload_reports_unprocessed_files(client, local_file, monkeypatch, caplog):
+    def dropped(ftp, local, remote):
+        raise ConnectionError("connection dropped")
+
+    monkeypatch.setattr(client, "_upload_with", dropped)
+    client.retry_attempts = 2
+    client.retry_multiplier = 1
+    client.parallel_upload([(str(local_file), f"/target{i}.bin") for i in range(5)])
+    assert caplog.text.count(f"File {local_file} was not uploaded") == 5
+
+
+def test_list_entries_strips_symlink_targets():
+    class ListOnly:
+        def mlsd(self, path):
+            raise ftplib.error_perm("500 MLSD not understood")
+
+        def retrlines(self, cmd, callback):
+            callback("lrwxrwxrwx 1 owner group 6 Jan 01 00:00 link -> target")
+            callback("-rw-r--r-- 1 owner group 6 Jan 01 00:00 file name.txt")
+
+    client = FTPClient("127.0.0.1", "user", "pass")
+    assert client._list_entries(ListOnly(), "/") == [("link", False), ("file name.txt", False)]
+
+
+def test_download_file_parallel_without_rest(client, server, local_file, tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(FTPHandler, "ftp_REST", lambda handler, line: handler.respond("502 Command not implemented."))
+    (server / "source.bin").write_bytes(local_file.read_bytes())
+    target = tmp_path / "target.bin"
+    client.download_file_parallel("/source.bin", str(target), parts=2)
+    assert target.read_bytes() == local_file.read_bytes()
+    assert "single-stream" in caplog.text